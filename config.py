@@ -1,30 +1,7 @@
 import os
-from dotenv import load_dotenv
-
-# Load environment variables from a .env file (if it exists)
-# This is useful for local development. In production, env vars are set directly.
-load_dotenv()
-
-# --- Database Configuration ---
-# These lines were commented out in your provided config.py.
-# They need to be uncommented and correctly use os.getenv to read from the environment.
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD") # IMPORTANT: Ensure this matches your .env or actual password!
-DB_PORT = os.getenv("DB_PORT")
-
-# --- Scraper Configuration ---
-SCRAPER_BASE_URL = os.getenv("SCRAPER_BASE_URL")
-
-SCRAPER_NEEDED_CATEGORIES = set(
-    os.getenv(
-        "SCRAPER_NEEDED_CATEGORIES",
-        "devops,it-infrastructure,data-analytics-and-management"
-    ).split(',')
-)
-
-SCRAPER_TEST_MODE = os.getenv("SCRAPER_TEST_MODE").lower() == "true"
+from dataclasses import dataclass
+from functools import cache
+from dotenv import dotenv_values
 
 HEADERS = {
     "User-Agent": (
@@ -34,9 +11,68 @@ HEADERS = {
     )
 }
 
-# --- Rate Limiting ---
-SLEEP_BETWEEN_CATEGORY_PAGES = int(os.getenv("SLEEP_BETWEEN_CATEGORY_PAGES"))
-SLEEP_BETWEEN_PRODUCT_PAGES = int(os.getenv("SLEEP_BETWEEN_PRODUCT_PAGES"))
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Typed, immutable application settings.
+    Built once by get_settings() from the environment and an optional .env file.
+    """
+    # --- Database Configuration ---
+    db_host: str | None
+    db_name: str | None
+    db_user: str | None
+    db_password: str | None # IMPORTANT: Ensure this matches your .env or actual password!
+    db_port: str | None
+    db_pool_max: int # Upper bound of connections kept by the shared psycopg2 connection pool
+    db_batch_size: int # Number of products the database writer accumulates before flushing them in one batch
 
-# --- Testing Limits (for SCRAPER_TEST_MODE) ---
-TEST_PRODUCT_LIMIT = int(os.getenv("TEST_PRODUCT_LIMIT"))
\ No newline at end of file
+    # --- Scraper Configuration ---
+    scraper_base_url: str | None
+    scraper_needed_categories: frozenset[str]
+    scraper_thread_count: int
+    scraper_process_count: int # Processes that parse and extract product pages; 0 keeps that work in the scraper threads
+    scraper_concurrency: int # Maximum number of concurrent in-flight requests for the asyncio scraper
+    scraper_async: bool # Use the asyncio/aiohttp pipeline instead of worker threads
+    scraper_test_mode: bool
+    scraper_skip_known_urls: bool # Skip product pages whose URL is already stored in the database
+
+    # --- Rate Limiting ---
+    sleep_between_category_pages: int
+    sleep_between_product_pages: int
+
+    # --- Testing Limits (for SCRAPER_TEST_MODE) ---
+    test_product_limit: int
+
+@cache
+def get_settings() -> Settings:
+    """
+    Parses the configuration once and returns the cached Settings instance.
+    Variables set in the real environment take precedence over the .env file
+    (the .env file is useful for local development; in production env vars are set directly).
+    """
+    env = {**dotenv_values(), **os.environ}
+    return Settings(
+        db_host=env.get("DB_HOST"),
+        db_name=env.get("DB_NAME"),
+        db_user=env.get("DB_USER"),
+        db_password=env.get("DB_PASSWORD"),
+        db_port=env.get("DB_PORT"),
+        db_pool_max=int(env.get("DB_POOL_MAX", "5")),
+        db_batch_size=int(env.get("DB_BATCH_SIZE", "100")),
+        scraper_base_url=env.get("SCRAPER_BASE_URL"),
+        scraper_needed_categories=frozenset(
+            env.get(
+                "SCRAPER_NEEDED_CATEGORIES",
+                "devops,it-infrastructure,data-analytics-and-management"
+            ).split(',')
+        ),
+        scraper_thread_count=int(env.get("SCRAPER_THREAD_COUNT", "5")),
+        scraper_process_count=int(env.get("SCRAPER_PROCESS_COUNT", "0")),
+        scraper_concurrency=int(env.get("SCRAPER_CONCURRENCY", "10")),
+        scraper_async=env.get("SCRAPER_ASYNC", "false").lower() == "true",
+        scraper_test_mode=env.get("SCRAPER_TEST_MODE", "false").lower() == "true",
+        scraper_skip_known_urls=env.get("SCRAPER_SKIP_KNOWN_URLS", "true").lower() == "true",
+        sleep_between_category_pages=int(env.get("SLEEP_BETWEEN_CATEGORY_PAGES", "3")),
+        sleep_between_product_pages=int(env.get("SLEEP_BETWEEN_PRODUCT_PAGES", "1")),
+        test_product_limit=int(env.get("TEST_PRODUCT_LIMIT", "10")),
+    )
@@ -1,14 +1,7 @@
 import logging
-from scr.orchestration.orchestrator import ScrapingOrchestrator
-
-# Імпортуємо конкретні реалізації, які будемо передавати оркестратору
-from scr.implementation.web_scraper import WebScraper 
-from scr.implementation.database import DatabaseManager  
-from scr.implementation.product_extractor import ProductExtractor  
-
-import config # Потрібен для передачі конфігурації при ініціалізації
 
 # --- Configure Logging for the entire application (moved here as the entry point) ---
+# Done before any project import, so every module logger only inherits levels that are already final.
 logging.basicConfig(
     level=logging.INFO, # Default logging level for console output
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -17,26 +10,56 @@ logging.basicConfig(
 logging.getLogger("requests").setLevel(logging.WARNING)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
+from scr.orchestration.orchestrator import ScrapingOrchestrator
+
+# Імпортуємо конкретні реалізації, які будемо передавати оркестратору
+from scr.implementation.web_scraper import WebScraper 
+from scr.implementation.database import DatabaseManager  
+from scr.implementation.product_extractor import ProductExtractor  
+
+import config # Потрібен для передачі конфігурації при ініціалізації
+
 logger = logging.getLogger(__name__) # Logger for the main script
 
 if __name__ == "__main__":
-    logger.info("Application started. Initializing ScrapingOrchestrator.")
+    settings = config.get_settings()
+    logger.info("Application started. Initializing %s.", "AsyncScrapingOrchestrator" if settings.scraper_async else "ScrapingOrchestrator")
     
     # 1. Створюємо конкретні реалізації залежностей
     # Ці об'єкти будуть "ін'єктовані" в оркестратор
-    main_scraper_instance = WebScraper(
-        base_url=config.SCRAPER_BASE_URL, 
-        headers=config.HEADERS
-    )
     db_manager_instance = DatabaseManager()
     product_extractor_instance = ProductExtractor()
 
-    # 2. Передаємо (ін'єктуємо) ці реалізації в ScrapingOrchestrator
-    orchestrator = ScrapingOrchestrator(
-        scraper=main_scraper_instance,
-        db_manager=db_manager_instance,
-        extractor=product_extractor_instance # Передаємо екстрактор
-    )
+    # 2. Передаємо (ін'єктуємо) ці реалізації в оркестратор
+    if settings.scraper_async:
+        # Імпортуємо тут, щоб aiohttp був потрібен лише для асинхронного режиму
+        from scr.implementation.async_web_scraper import AsyncWebScraper
+        from scr.orchestration.async_orchestrator import AsyncScrapingOrchestrator
+
+        orchestrator = AsyncScrapingOrchestrator(
+            scraper=AsyncWebScraper(
+                base_url=settings.scraper_base_url,
+                headers=config.HEADERS,
+                concurrency=settings.scraper_concurrency
+            ),
+            db_manager=db_manager_instance,
+            extractor=product_extractor_instance
+        )
+    else:
+        main_scraper_instance = WebScraper(
+            base_url=settings.scraper_base_url, 
+            headers=config.HEADERS,
+            # Один пул keep-alive з'єднань на всі потоки: воркери продуктів + паралельні сторінки категорій
+            pool_maxsize=settings.scraper_thread_count * 2
+        )
+        orchestrator = ScrapingOrchestrator(
+            scraper=main_scraper_instance,
+            db_manager=db_manager_instance,
+            extractor=product_extractor_instance # Передаємо екстрактор
+        )
     
-    orchestrator.run_scraping()
+    try:
+        orchestrator.run_scraping()
+    finally:
+        DatabaseManager.close_pool() # Закриваємо всі з'єднання пулу БД
     logger.info("Application finished.")
\ No newline at end of file
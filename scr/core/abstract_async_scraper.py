@@ -0,0 +1,31 @@
+import abc
+from lxml import html
+
+class AbstractAsyncWebScraper(abc.ABC):
+    """
+    Абстрактний базовий клас для асинхронних веб-скраперів.
+    Визначає інтерфейс, який повинні реалізовувати конкретні asyncio-скрапери.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    async def fetch_page(self, url: str, sleep_time: int = 0) -> html.HtmlElement | None:
+        """
+        Абстрактний метод для асинхронного отримання веб-сторінки та її парсингу.
+        """
+        pass
+
+    @abc.abstractmethod
+    def add_seen_urls(self, urls: set[str]):
+        """
+        Абстрактний метод для реєстрації URL, які вже оброблено і не потрібно завантажувати повторно.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def close_session(self):
+        """
+        Абстрактний метод для закриття будь-яких відкритих сесій.
+        """
+        pass
@@ -1,5 +1,4 @@
 import abc
-import psycopg2
 
 class AbstractDatabaseManager(abc.ABC):
     """
@@ -7,6 +6,8 @@ class AbstractDatabaseManager(abc.ABC):
     Визначає інтерфейс, який повинні реалізовувати конкретні менеджери БД.
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def create_products_table(self):
         """
@@ -14,6 +15,13 @@ class AbstractDatabaseManager(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def load_known_urls(self) -> set[str]:
+        """
+        Абстрактний метод для отримання URL усіх продуктів, які вже збережено в базі даних.
+        """
+        pass
+
     @abc.abstractmethod
     def insert_product_data(self, product_data: dict):
         """
@@ -21,6 +29,28 @@ class AbstractDatabaseManager(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def insert_product_data_batch(self, rows: list[dict]) -> int:
+        """
+        Абстрактний метод для вставки або оновлення пакета продуктів за один запит.
+        Повертає кількість фактично переданих рядків (після видалення дублікатів URL).
+        """
+        pass
+
+    @abc.abstractmethod
+    def commit(self):
+        """
+        Абстрактний метод для фіксації поточної транзакції.
+        """
+        pass
+
+    @abc.abstractmethod
+    def rollback(self):
+        """
+        Абстрактний метод для відкату поточної транзакції.
+        """
+        pass
+
     # Також варто включити методи контекстного менеджера в інтерфейс,
     # щоб будь-яка реалізація могла використовуватися з "with"
     @abc.abstractmethod
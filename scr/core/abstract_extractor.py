@@ -8,6 +8,8 @@ class AbstractProductExtractor(abc.ABC):
     Визначає інтерфейс, який повинні реалізовувати конкретні екстрактори.
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def extract_product_details(self, product_tree: html.HtmlElement, listing_product_name: str, listing_category: str) -> dict:
         """
@@ -7,6 +7,9 @@ class AbstractWebScraper(abc.ABC):
     Визначає інтерфейс, який повинні реалізовувати конкретні скрапери.
     """
 
+    # Порожні слоти не дають підкласам зі __slots__ отримати __dict__ через базовий клас
+    __slots__ = ()
+
     @abc.abstractmethod
     def fetch_page(self, url: str, sleep_time: int = 0) -> html.HtmlElement | None:
         """
@@ -14,6 +17,30 @@ class AbstractWebScraper(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def fetch_content(self, url: str, sleep_time: int = 0) -> bytes | None:
+        """
+        Абстрактний метод для отримання сирого вмісту сторінки без парсингу
+        (парсинг можна виконати окремо, наприклад в іншому процесі, через parse_content).
+        """
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def parse_content(content: bytes) -> html.HtmlElement | None:
+        """
+        Абстрактний метод для парсингу вмісту, отриманого через fetch_content.
+        Статичний, щоб його можна було передати в пул процесів без самого скрапера.
+        """
+        pass
+
+    @abc.abstractmethod
+    def add_seen_urls(self, urls: set[str]):
+        """
+        Абстрактний метод для реєстрації URL, які вже оброблено і не потрібно завантажувати повторно.
+        """
+        pass
+
     @abc.abstractmethod
     def close_session(self):
         """
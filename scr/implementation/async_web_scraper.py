@@ -0,0 +1,115 @@
+# async_web_scraper.py
+import asyncio
+import logging
+from urllib.parse import urljoin
+
+import aiohttp
+from lxml import html
+
+import config
+from scr.core.abstract_async_scraper import AbstractAsyncWebScraper
+
+# Configure logging for this module
+logger = logging.getLogger(__name__) # Level is inherited from the root logger configured in main.py
+
+class AsyncWebScraper(AbstractAsyncWebScraper):
+    """
+    Fetches pages concurrently over a single aiohttp session and parses them into lxml trees.
+    Concurrency is bounded by a semaphore, so at most `concurrency` requests are in flight at once.
+    Request rates are limited by the orchestrator's AsyncTokenBucket, not here.
+    """
+
+    __slots__ = ('base_url', 'headers', 'concurrency', '_sem', '_session', '_parser', '_seen')
+
+    def __init__(self, base_url: str = config.get_settings().scraper_base_url, headers: dict = config.HEADERS, concurrency: int = config.get_settings().scraper_concurrency):
+        """
+        Initializes the AsyncWebScraper.
+
+        Args:
+            base_url (str): The base URL for the website to scrape.
+            headers (dict): HTTP headers to use for requests.
+            concurrency (int): Maximum number of requests in flight at the same time.
+        """
+        self.base_url = base_url
+        self.headers = headers
+        self.concurrency = concurrency
+        self._sem = asyncio.Semaphore(concurrency)
+        self._session = None # aiohttp wants the session to be created inside a running event loop
+        self._parser = html.HTMLParser(
+            collect_ids=False, remove_comments=True, remove_pis=True, no_network=True, recover=True
+        )
+        # URLs that are already known (e.g. stored in the database) and must not be fetched again
+        self._seen = set()
+        logger.info("AsyncWebScraper initialized for base URL: %s (concurrency: %d)", self.base_url, concurrency)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Creates the shared ClientSession on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    def _parse(self, body: bytes) -> html.HtmlElement:
+        """Parses raw page bytes into an lxml tree (runs in an executor thread)."""
+        return html.fromstring(body, parser=self._parser)
+
+    async def fetch_page(self, url: str, sleep_time: int = 0) -> html.HtmlElement | None:
+        """
+        Fetches a web page and returns its parsed lxml HTML tree.
+
+        Args:
+            url (str): The full or site-relative URL of the page to fetch.
+            sleep_time (int): Seconds to sleep before making the request (without holding a concurrency slot).
+
+        Returns:
+            lxml.html.HtmlElement | None: The parsed HTML tree if successful, None otherwise.
+        """
+        full_url = urljoin(self.base_url, url)
+        if full_url in self._seen:
+            logger.info("Skipping already known page: %s", full_url)
+            return None
+
+        # Slept before taking a semaphore slot, so waiting requests do not block requests that are ready to go
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
+
+        async with self._sem:
+            try:
+                logger.info("Attempting to fetch: %s", full_url)
+                async with self._get_session().get(full_url) as response:
+                    response.raise_for_status() # Raises ClientResponseError for bad responses (4xx or 5xx)
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error("❌ Network or HTTP error fetching %s: %s", full_url, e)
+                return None
+
+        try:
+            # Parsing happens outside the semaphore and off the event loop, so it overlaps with other downloads
+            tree = await asyncio.get_running_loop().run_in_executor(None, self._parse, body)
+            logger.info("✓ Successfully fetched and parsed: %s", full_url)
+            return tree
+        except (html.etree.ParserError, html.etree.XMLSyntaxError) as e:
+            logger.error("✗❌ HTML parsing error for %s: %s", full_url, e)
+            return None
+        except Exception as e:
+            logger.error("❌ An unexpected error occurred while fetching %s: %s", full_url, e)
+            return None
+
+    def add_seen_urls(self, urls: set[str]):
+        """
+        Registers URLs that fetch_page should skip (returning None without a request).
+
+        Args:
+            urls (set[str]): Full URLs that are already processed.
+        """
+        self._seen.update(urls)
+        logger.info("AsyncWebScraper will skip %d already known URLs.", len(urls))
+
+    async def close_session(self):
+        """Closes the aiohttp session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        logger.info("Aiohttp session closed.")
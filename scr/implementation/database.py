@@ -1,14 +1,41 @@
 import psycopg2
 from psycopg2 import sql
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import logging
+import threading
 from scr.core.abstract_database_manager import AbstractDatabaseManager 
 import config
 
 # Configure logging for this module
 logger = logging.getLogger(__name__)
-# Set to INFO for general messages, DEBUG for more verbosity
-# Changed some INFO to DEBUG in _connect/_disconnect for less verbose output during normal operation
-logger.setLevel(logging.INFO) 
+# The level is inherited from the root logger configured in main.py.
+# _connect/_disconnect log at DEBUG for less verbose output during normal operation
+
+# Shared connection pool for the whole process. It is created lazily on first use
+# (so importing this module never touches the database) and closed via DatabaseManager.close_pool().
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+def _get_pool() -> ThreadedConnectionPool:
+    """
+    Returns the module-level connection pool, creating it on first call.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None or _POOL.closed:
+            settings = config.get_settings()
+            _POOL = ThreadedConnectionPool(
+                minconn=2,
+                maxconn=settings.db_pool_max,
+                host=settings.db_host,
+                database=settings.db_name,
+                user=settings.db_user,
+                password=settings.db_password,
+                port=settings.db_port
+            )
+            logger.debug("✓ Database connection pool created.")
+        return _POOL
 
 # Змінюємо оголошення класу, щоб він успадковував від AbstractDatabaseManager
 class DatabaseManager(AbstractDatabaseManager):
@@ -17,55 +44,103 @@ class DatabaseManager(AbstractDatabaseManager):
     Adheres to SRP by handling only database-related concerns.
     """
 
+    __slots__ = ('db_host', 'db_name', 'db_user', 'db_password', 'db_port', 'conn', 'cur', '_pool')
+
+    # Canonical column order of a product row, as produced by ProductExtractor (+ 'url')
+    _COLUMNS = ('product_name', 'category', 'price_median', 'price_low', 'price_high', 'description', 'url')
+
+    # "col = EXCLUDED.col" for every non-key column, so each value is sent to the server only once
+    _UPDATE_SET = sql.SQL(', ').join(
+        sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(col))
+        for col in _COLUMNS if col != 'url'
+    )
+
+    # Single-row upsert, composed once at class creation instead of on every insertion
+    _INSERT_SQL = sql.SQL(
+        "INSERT INTO products ({}) VALUES ({}) "
+        "ON CONFLICT (url) DO UPDATE SET {}"
+    ).format(
+        sql.SQL(', ').join(map(sql.Identifier, _COLUMNS)),
+        sql.SQL(', ').join(sql.Placeholder() * len(_COLUMNS)),
+        _UPDATE_SET
+    )
+
+    # Upsert used by the batched path; execute_values expands the single %s into a multi-row VALUES list
+    _BATCH_INSERT_SQL = sql.SQL(
+        "INSERT INTO products ({}) VALUES %s "
+        "ON CONFLICT (url) DO UPDATE SET {}"
+    ).format(
+        sql.SQL(', ').join(map(sql.Identifier, _COLUMNS)),
+        _UPDATE_SET
+    )
+
     def __init__(self):
         """
         Initializes the DatabaseManager with connection parameters from config.
         """
-        self.db_host = config.DB_HOST
-        self.db_name = config.DB_NAME
-        self.db_user = config.DB_USER
-        self.db_password = config.DB_PASSWORD
-        self.db_port = config.DB_PORT
+        settings = config.get_settings()
+        self.db_host = settings.db_host
+        self.db_name = settings.db_name
+        self.db_user = settings.db_user
+        self.db_password = settings.db_password
+        self.db_port = settings.db_port
         self.conn = None
         self.cur = None
+        self._pool = None # The pool that handed out self.conn; the connection is always returned to it
 
     def _connect(self):
         """
-        Establishes a connection to the PostgreSQL database.
+        Checks out a connection from the shared pool.
         Handles connection errors gracefully.
-        Only connects if no active connection exists.
+        Only checks out a connection if no active connection exists.
         """
         # Check if connection is already active and not closed
         if self.conn is None or self.conn.closed:
             try:
-                self.conn = psycopg2.connect(
-                    host=self.db_host,
-                    database=self.db_name,
-                    user=self.db_user,
-                    password=self.db_password,
-                    port=self.db_port
-                )
+                self._pool = _get_pool()
+                self.conn = self._pool.getconn()
                 self.cur = self.conn.cursor()
-                logger.debug("✓ Database connection established.") # Debug level for frequent connections
+                logger.debug("✓ Database connection checked out from pool.") # Debug level for frequent connections
             except psycopg2.Error as e:
-                logger.error(f"✗ Database connection error: {e}")
+                logger.error("✗ Database connection error: %s", e)
                 self.conn = None 
                 self.cur = None
+                self._pool = None
                 raise 
         else:
             logger.debug("Database already connected.") # Indicate connection reuse
 
     def _disconnect(self):
         """
-        Closes the database cursor and connection if they are open.
+        Closes the database cursor and returns the connection to the pool.
         """
         if self.cur:
             self.cur.close()
             self.cur = None
         if self.conn:
-            self.conn.close()
+            if self._pool is None or self._pool.closed:
+                # close_pool() already ran (e.g. a writer thread outlived the shutdown): there is nothing
+                # to return the connection to, and a freshly created pool would reject it
+                self.conn.close()
+            else:
+                # A connection that was closed underneath us is discarded instead of being reused
+                self._pool.putconn(self.conn, close=bool(self.conn.closed))
             self.conn = None
-        logger.debug("✓ Database connection closed.") # Debug level for frequent disconnections
+            self._pool = None
+        logger.debug("✓ Database connection returned to pool.") # Debug level for frequent disconnections
+
+    @classmethod
+    def close_pool(cls):
+        """
+        Closes every connection held by the shared pool.
+        Should be called once, when the application has finished working with the database.
+        """
+        global _POOL
+        with _POOL_LOCK:
+            if _POOL is not None and not _POOL.closed:
+                _POOL.closeall()
+                logger.info("✓ Database connection pool closed.")
+            _POOL = None
 
     def create_products_table(self):
         """
@@ -91,11 +166,29 @@ class DatabaseManager(AbstractDatabaseManager):
             self.conn.commit() # Commit immediately after table creation
             logger.info("✓ 'products' table ensured to exist or created successfully.")
         except Exception as e:
-            logger.error(f"✗ Error creating 'products' table: {e}")
+            logger.error("✗ Error creating 'products' table: %s", e)
             raise 
         finally:
             self._disconnect()
 
+    def load_known_urls(self) -> set[str]:
+        """
+        Returns the URLs of all products already stored in the 'products' table.
+        Like create_products_table, this manages its own connection because it runs
+        once during setup, before the main scraping loop.
+        """
+        try:
+            self._connect()
+            self.cur.execute("SELECT url FROM products")
+            known_urls = {row[0] for row in self.cur}
+            logger.info("✓ Loaded %d already stored product URLs.", len(known_urls))
+            return known_urls
+        except Exception as e:
+            logger.error("✗ Error loading stored product URLs: %s", e)
+            raise
+        finally:
+            self._disconnect()
+
     def insert_product_data(self, product_data: dict):
         """
         Inserts or updates product data into the 'products' table.
@@ -109,34 +202,67 @@ class DatabaseManager(AbstractDatabaseManager):
             logger.error("Attempted to insert data without an active database connection. This indicates a logic error in the calling code.")
             raise psycopg2.InterfaceError("No active database connection for insertion.")
 
-        try:
-            columns = product_data.keys()
-            values = [product_data[col] for col in columns]
-
-            insert_query = sql.SQL(
-                "INSERT INTO products ({}) VALUES ({}) "
-                "ON CONFLICT (url) DO UPDATE SET {}"
-            ).format(
-                sql.SQL(', ').join(map(sql.Identifier, columns)),
-                sql.SQL(', ').join(sql.Placeholder() * len(columns)),
-                sql.SQL(', ').join(
-                    sql.SQL("{} = {}").format(sql.Identifier(col), sql.Placeholder())
-                    for col in columns if col != 'url'
-                )
-            )
+        # Bound once and shared by every log call below
+        url = product_data.get('url', 'Unknown URL')
 
-            self.cur.execute(insert_query, values + [product_data[col] for col in columns if col != 'url'])
+        try:
+            self.cur.execute(self._INSERT_SQL, tuple(product_data[col] for col in self._COLUMNS))
             # IMPORTANT: DO NOT COMMIT HERE. The context manager will commit all transactions at once.
-            logger.debug(f"Prepared insert for '{product_data.get('product_name', 'Unknown')}' (will commit later).")
+            logger.debug("Prepared insert for %s (will commit later).", url)
         except psycopg2.Error as e:
-            logger.error(f"✗ Database error during insertion for {product_data.get('url', 'Unknown URL')}: {e}")
+            logger.error("✗ Database error during insertion for %s: %s", url, e)
             # Do not rollback here either. Let the context manager handle the overall transaction rollback if needed.
             raise
         except Exception as e:
-            logger.error(f"✗ Unexpected error during database insertion for {product_data.get('url', 'Unknown URL')}: {e}")
+            logger.error("✗ Unexpected error during database insertion for %s: %s", url, e)
             raise
         # No finally block for disconnect/commit here, as connection is managed by __enter__/__exit__
 
+    def insert_product_data_batch(self, rows: list[dict]) -> int:
+        """
+        Inserts or updates many products in one round trip using execute_values.
+        Same contract as insert_product_data: ASSUMES an active connection and does NOT commit.
+        Returns the number of rows sent, i.e. after duplicate URLs have been collapsed.
+        """
+        if self.conn is None or self.cur is None or self.conn.closed:
+            logger.error("Attempted to insert a batch without an active database connection. This indicates a logic error in the calling code.")
+            raise psycopg2.InterfaceError("No active database connection for insertion.")
+
+        if not rows:
+            return 0
+
+        # One statement must not upsert the same url twice, so keep only the latest row per url
+        unique_rows = {row['url']: row for row in rows}.values()
+        values = [tuple(row[col] for col in self._COLUMNS) for row in unique_rows]
+
+        try:
+            execute_values(self.cur, self._BATCH_INSERT_SQL, values, page_size=500)
+            # IMPORTANT: DO NOT COMMIT HERE. The caller commits once per batch (or the context manager on exit).
+            logger.debug("Prepared batch insert of %d products (will commit later).", len(values))
+            return len(values)
+        except psycopg2.Error as e:
+            logger.error("✗ Database error during batch insertion of %d products: %s", len(values), e)
+            raise
+
+
+    def commit(self):
+        """
+        Commits the current transaction on the active connection.
+        Lets a long-lived writer make each batch durable without leaving the 'with' block.
+        """
+        if self.conn is None or self.conn.closed:
+            raise psycopg2.InterfaceError("No active database connection to commit.")
+        self.conn.commit()
+        logger.debug("✓ Transaction committed.")
+
+    def rollback(self):
+        """
+        Rolls back the current transaction on the active connection, so the next batch starts clean.
+        """
+        if self.conn is None or self.conn.closed:
+            raise psycopg2.InterfaceError("No active database connection to roll back.")
+        self.conn.rollback()
+        logger.debug("Transaction rolled back.")
 
     def __enter__(self):
         """
@@ -152,7 +278,7 @@ class DatabaseManager(AbstractDatabaseManager):
         if exc_type: # An exception occurred within the 'with' block
             if self.conn:
                 self.conn.rollback() # Rollback all operations in this transaction
-                logger.error(f"✗ Transaction rolled back due to exception: {exc_val}")
+                logger.error("✗ Transaction rolled back due to exception: %s", exc_val)
         elif self.conn:
             self.conn.commit() # Commit all successful operations in this transaction
             logger.info("✓ Transaction committed successfully.")
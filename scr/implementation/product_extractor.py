@@ -1,10 +1,36 @@
-from lxml import html
+from lxml import html, etree
 import logging
+import re
 from scr.core.abstract_extractor import AbstractProductExtractor
 
 # Configure logging for this module
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO) # Set to INFO for general messages, DEBUG for more verbosity
+logger = logging.getLogger(__name__) # Level is inherited from the root logger configured in main.py
+
+# All product-detail nodes are collected by one compiled union query (results come back in document order)
+# and dispatched by tag in Python, instead of running a separate full-document XPath per field.
+_DETAILS_XPATH = etree.XPath(
+    '//h1[@class="rt-Heading rt-r-size-5"]'
+    ' | //div[contains(@class, "rt-Box _read-more-box__content_122o3_1")]'
+    ' | //div[contains(@class, "rt-r-ai-end")]/span[@class="v-fw-700 v-fs-24"]'
+    ' | //div[contains(@class, "rt-Grid") and contains(@class, "rt-r-gtc") and contains(@class, "_rangeSlider")]'
+    ' | //nav[contains(@aria-label, "breadcrumb")]//a[contains(@href, "/categories/")]'
+)
+_DESC_CLASS = "rt-Box _read-more-box__content_122o3_1"
+_RANGE_CLASSES = ("rt-Grid", "rt-r-gtc", "_rangeSlider")
+# Generic headings that are not actual product descriptions; matched case-insensitively at the start of the text
+_DESC_SKIP = re.compile(r'(?:what is|how it works)', re.IGNORECASE)
+
+
+def _first_text(element: html.HtmlElement) -> str | None:
+    """
+    Returns the first direct text node of an element (what `element/text()` would yield first), or None.
+    """
+    if element.text is not None:
+        return element.text
+    for child in element:
+        if child.tail is not None:
+            return child.tail
+    return None
 
 # Змінюємо оголошення класу, щоб він успадковував від AbstractProductExtractor
 class ProductExtractor(AbstractProductExtractor):
@@ -13,6 +39,8 @@ class ProductExtractor(AbstractProductExtractor):
     Adheres to SRP by focusing solely on data extraction from the HTML structure.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         """
         Initializes the ProductExtractor.
@@ -34,70 +62,89 @@ class ProductExtractor(AbstractProductExtractor):
         Returns:
             dict: A dictionary containing the extracted product details.
         """
-        product_details = {
-            'product_name': listing_product_name, 
-            'category': listing_category,       
-            'price_median': "Not specified",
-            'price_low': "Not specified",
-            'price_high': "Not specified",
-            'description': "No detailed description found."
-        }
-
-        # --- Extract Product Name ---
-        product_name_detail_xpath = '//h1[@class="rt-Heading rt-r-size-5"]/text()'
-        product_name_detail_element = product_tree.xpath(product_name_detail_xpath)
-        if product_name_detail_element:
-            product_details['product_name'] = product_name_detail_element[0].strip()
-        logger.debug(f"Extracted Product Name: {product_details['product_name']}")
-
-        # --- Extract Description ---
-        description_xpath = '//div[contains(@class, "rt-Box _read-more-box__content_122o3_1")]'
-        product_description_elements = product_tree.xpath(description_xpath)
+        # Only fields found on the page are set here; fallbacks are filled in once at the end
+        product_details = {}
+
+        name_text = None
+        median_text = None
+        category_text = None
+        price_range_container = None
         extracted_descriptions = []
-        for elem in product_description_elements:
-            text = elem.text_content().strip()
-            # Filter out short or generic texts that are not actual descriptions
-            if len(text) > 20 and not text.lower().startswith("what is") and not text.lower().startswith("how it works"):
-                extracted_descriptions.append(text)
+
+        # --- Single pass over every node of interest ---
+        for elem in _DETAILS_XPATH(product_tree):
+            tag = elem.tag
+            if tag == 'h1':
+                if name_text is None:
+                    name_text = _first_text(elem)
+            elif tag == 'span':
+                if median_text is None:
+                    median_text = _first_text(elem)
+            elif tag == 'a':
+                if category_text is None:
+                    category_text = _first_text(elem)
+            else:
+                css_class = elem.get('class', '')
+                if _DESC_CLASS in css_class:
+                    if len(elem):
+                        # Nested markup: same text as text_content(), without building a lazy "smart string"
+                        text = ''.join(elem.itertext()).strip()
+                    else:
+                        # Leaf node: its own text is the whole content
+                        text = (elem.text or '').strip()
+                    # Filter out short or generic texts that are not actual descriptions
+                    if len(text) > 20 and not _DESC_SKIP.match(text):
+                        extracted_descriptions.append(text)
+                if price_range_container is None and all(c in css_class for c in _RANGE_CLASSES):
+                    price_range_container = elem
+
+        # --- Product Name ---
+        if name_text is not None:
+            product_details['product_name'] = name_text.strip()
+
+        # --- Description ---
         if extracted_descriptions:
             product_details['description'] = "\n".join(extracted_descriptions)
-        logger.debug(f"Extracted Description snippet: {product_details['description'][:100]}...")
-
 
-        # --- Extract Median Price ---
-        median_price_xpath = '//div[contains(@class, "rt-r-ai-end")]/span[@class="v-fw-700 v-fs-24"]/text()'
-        median_price_span = product_tree.xpath(median_price_xpath)
-        if median_price_span:
-            product_details['price_median'] = median_price_span[0].strip()
-        logger.debug(f"Extracted Median Price: {product_details['price_median']}")
-
-
-        # --- Extract Price Range ---
-        price_range_container_xpath = '//div[contains(@class, "rt-Grid") and contains(@class, "rt-r-gtc") and contains(@class, "_rangeSlider")]'
-        price_range_container = product_tree.xpath(price_range_container_xpath)
-
-        if price_range_container:
-            low_price_xpath_relative = './span[1]/text()'
-            low_price_element = price_range_container[0].xpath(low_price_xpath_relative)
-            if low_price_element:
-                product_details['price_low'] = low_price_element[0].strip()
-            logger.debug(f"Extracted Low Price: {product_details['price_low']}")
-
-
-            high_price_xpath_relative = './span[2]/text()'
-            high_price_element = price_range_container[0].xpath(high_price_xpath_relative)
-            if high_price_element:
-                product_details['price_high'] = high_price_element[0].strip()
-            logger.debug(f"Extracted High Price: {product_details['price_high']}")
+        # --- Median Price ---
+        if median_text is not None:
+            product_details['price_median'] = median_text.strip()
+
+        # --- Price Range ---
+        if price_range_container is not None:
+            # The first two <span> children hold the low and high prices (what ./span[1]/text() and ./span[2]/text()
+            # selected); reading them directly keeps the whole page at a single XPath evaluation
+            range_spans = price_range_container.iterchildren('span')
+            for field in ('price_low', 'price_high'):
+                span = next(range_spans, None)
+                if span is None:
+                    break
+                price_text = _first_text(span)
+                if price_text is not None:
+                    product_details[field] = price_text.strip()
         else:
             logger.debug("Price range container not found using the new XPath.")
-        
-        # --- Extract Category (from breadcrumbs if available) ---
-        category_detail_xpath = '//nav[contains(@aria-label, "breadcrumb")]//a[contains(@href, "/categories/")]/text()'
-        category_detail_element = product_tree.xpath(category_detail_xpath)
-        if category_detail_element:
-            product_details['category'] = category_detail_element[0].strip()
-        # If not found in breadcrumbs, it retains the 'listing_category' fallback.
-        logger.debug(f"Extracted Category: {product_details['category']}")
+
+        # --- Category (from breadcrumbs if available) ---
+        if category_text is not None:
+            product_details['category'] = category_text.strip()
+
+        # --- Fallbacks for everything the page did not provide ---
+        # Name and category fall back to the values seen on the category listing page.
+        product_details.setdefault('product_name', listing_product_name)
+        product_details.setdefault('category', listing_category)
+        product_details.setdefault('price_median', "Not specified")
+        product_details.setdefault('price_low', "Not specified")
+        product_details.setdefault('price_high', "Not specified")
+        product_details.setdefault('description', "No detailed description found.")
+
+        # One guarded call instead of a debug line per field: at INFO level this costs a single level check
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Extracted product: name=%s, category=%s, median=%s, low=%s, high=%s, description=%.100s...",
+                product_details['product_name'], product_details['category'],
+                product_details['price_median'], product_details['price_low'],
+                product_details['price_high'], product_details['description']
+            )
 
         return product_details
\ No newline at end of file
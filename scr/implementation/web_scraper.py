@@ -1,15 +1,23 @@
 # web_scraper.py
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from lxml import html
 import time
 import logging
+from urllib.parse import urljoin
 
 import config
 from scr.core.abstract_scraper import AbstractWebScraper 
 
 # Configure logging for this module
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO) # Set to INFO for general messages, DEBUG for more verbosity
+logger = logging.getLogger(__name__) # Level is inherited from the root logger configured in main.py
+
+# Comments, processing instructions and the ID index are never used by the extractors, so the parser
+# skips building them; no_network keeps it from ever fetching external DTDs or entities
+_PARSER_OPTIONS = dict(collect_ids=False, remove_comments=True, remove_pis=True, no_network=True, recover=True)
+# Size of the body chunks handed to the incremental parser while the response is still downloading
+_CHUNK_SIZE = 65536
 
 # Змінюємо оголошення класу, щоб він успадковував від AbstractWebScraper
 class WebScraper(AbstractWebScraper): # <--- ЗМІНА ТУТ
@@ -18,18 +26,53 @@ class WebScraper(AbstractWebScraper): # <--- ЗМІНА ТУТ
     Provides methods for fetching pages with error handling and rate limiting.
     """
 
-    def __init__(self, base_url: str = config.SCRAPER_BASE_URL, headers: dict = config.HEADERS):
+    __slots__ = ('base_url', 'headers', 'session', '_seen')
+
+    def __init__(self, base_url: str = config.get_settings().scraper_base_url, headers: dict = config.HEADERS, pool_maxsize: int = config.get_settings().scraper_thread_count * 2):
         """
         Initializes the WebScraper with a base URL and HTTP headers.
 
         Args:
             base_url (str): The base URL for the website to scrape.
             headers (dict): HTTP headers to use for requests.
+            pool_maxsize (int): Number of keep-alive connections kept open to the scraped host
+                                (by default twice the scraper thread count, so category fetches
+                                overlapping with product workers also reuse connections).
         """
         self.base_url = base_url
         self.headers = headers
         self.session = requests.Session() # Use a session for persistent connections and header management
-        logger.info(f"WebScraper initialized for base URL: {self.base_url}")
+        # A single host is scraped, so one connection pool is enough; it must be as large as the number
+        # of concurrent requests, otherwise connections beyond the default 10 are discarded and re-opened.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # URLs that are already known (e.g. stored in the database) and must not be fetched again
+        self._seen = set()
+        logger.info("WebScraper initialized for base URL: %s", self.base_url)
+
+    def _prepare_request(self, url: str, sleep_time: int) -> str | None:
+        """
+        Resolves the full URL and sleeps `sleep_time` seconds before the request.
+        Returns None (without sleeping) if the URL is already known and must be skipped.
+        Request rates across workers are limited by the orchestrator's TokenBucket, not here.
+        """
+        # urljoin leaves absolute URLs untouched and resolves site-relative ones against the base URL
+        full_url = urljoin(self.base_url, url)
+
+        # Checked before any sleep, so known pages cost neither a request nor a delay
+        if full_url in self._seen:
+            logger.info("Skipping already known page: %s", full_url)
+            return None
+
+        if sleep_time > 0:
+            logger.debug("Sleeping for %s seconds before fetching %s", sleep_time, full_url)
+            time.sleep(sleep_time)
+        return full_url
 
     def fetch_page(self, url: str, sleep_time: int = 0) -> html.HtmlElement | None:
         """
@@ -37,37 +80,93 @@ class WebScraper(AbstractWebScraper): # <--- ЗМІНА ТУТ
 
         Args:
             url (str): The full URL of the page to fetch.
-            sleep_time (int): Seconds to sleep before making the request (for rate limiting).
+            sleep_time (int): Seconds to sleep before making the request.
 
         Returns:
             lxml.html.HtmlElement | None: The parsed HTML tree if successful, None otherwise.
         """
-        if sleep_time > 0:
-            logger.debug(f"Sleeping for {sleep_time} seconds before fetching {url}")
-            time.sleep(sleep_time)
+        full_url = self._prepare_request(url, sleep_time)
+        if full_url is None:
+            return None
 
         try:
-            # Змінив логіку формування full_url для більшої надійності, враховуючи urljoin
-            full_url = requests.compat.urljoin(self.base_url, url) if url.startswith('/') else url
+            logger.info("Attempting to fetch: %s", full_url)
+            # Chunks are fed to the parser as they arrive, so parsing overlaps with the network transfer.
+            # A feed parser keeps per-document state, hence one parser per call (workers share this scraper).
+            parser = html.HTMLParser(**_PARSER_OPTIONS)
+            with self.session.get(full_url, headers=self.headers, timeout=10, stream=True) as response: # Added timeout
+                response.raise_for_status() # Raises HTTPError for bad responses (4xx or 5xx)
 
-            logger.info(f"Attempting to fetch: {full_url}")
-            response = self.session.get(full_url, headers=self.headers, timeout=10) # Added timeout
-            response.raise_for_status() # Raises HTTPError for bad responses (4xx or 5xx)
+                for chunk in response.iter_content(chunk_size=_CHUNK_SIZE): # Already gzip/deflate-decoded bytes
+                    parser.feed(chunk)
+            tree = parser.close()
 
-            # Use response.content for fromstring, as it expects bytes
-            tree = html.fromstring(response.content)
-            logger.info(f"✓ Successfully fetched and parsed: {full_url}")
+            if tree is None:
+                logger.error("✗❌ HTML parsing error for %s: empty document", full_url)
+                return None
+            logger.info("✓ Successfully fetched and parsed: %s", full_url)
             return tree
         except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Network or HTTP error fetching {full_url}: {e}")
+            logger.error("❌ Network or HTTP error fetching %s: %s", full_url, e)
             return None
         except html.etree.XMLSyntaxError as e:
-            logger.error(f"✗❌ HTML parsing error for {full_url}: {e}")
+            logger.error("✗❌ HTML parsing error for %s: %s", full_url, e)
             return None
         except Exception as e:
-            logger.error(f"❌ An unexpected error occurred while fetching {full_url}: {e}")
+            logger.error("❌ An unexpected error occurred while fetching %s: %s", full_url, e)
+            return None
+
+    def fetch_content(self, url: str, sleep_time: int = 0) -> bytes | None:
+        """
+        Fetches a web page and returns its raw (already content-decoded) body without parsing it.
+        Used when parsing runs elsewhere, e.g. in a process pool via parse_content().
+
+        Args:
+            url (str): The full URL of the page to fetch.
+            sleep_time (int): Seconds to sleep before making the request.
+
+        Returns:
+            bytes | None: The response body if successful, None otherwise.
+        """
+        full_url = self._prepare_request(url, sleep_time)
+        if full_url is None:
+            return None
+
+        try:
+            logger.info("Attempting to fetch: %s", full_url)
+            response = self.session.get(full_url, headers=self.headers, timeout=10)
+            response.raise_for_status() # Raises HTTPError for bad responses (4xx or 5xx)
+            logger.info("✓ Successfully fetched: %s", full_url)
+            return response.content # Raw bytes: lxml detects the charset itself
+        except requests.exceptions.RequestException as e:
+            logger.error("❌ Network or HTTP error fetching %s: %s", full_url, e)
+            return None
+
+    @staticmethod
+    def parse_content(content: bytes) -> html.HtmlElement | None:
+        """
+        Parses a body returned by fetch_content() into an lxml HTML tree.
+        Static and free of scraper state, so it can run in a worker process.
+
+        Returns:
+            lxml.html.HtmlElement | None: The parsed HTML tree, or None if the content cannot be parsed.
+        """
+        try:
+            return html.fromstring(content, parser=html.HTMLParser(**_PARSER_OPTIONS))
+        except (html.etree.ParserError, html.etree.XMLSyntaxError) as e:
+            logger.error("✗❌ HTML parsing error: %s", e)
             return None
 
+    def add_seen_urls(self, urls: set[str]):
+        """
+        Registers URLs that fetch_page should skip (returning None without a request).
+
+        Args:
+            urls (set[str]): Full URLs that are already processed.
+        """
+        self._seen.update(urls)
+        logger.info("WebScraper will skip %d already known URLs.", len(urls))
+
     def close_session(self):
         """Closes the requests session."""
         self.session.close()
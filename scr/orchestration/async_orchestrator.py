@@ -0,0 +1,131 @@
+import asyncio
+import time
+import logging
+
+# Імпортуємо абстрактні класи замість конкретних реалізацій
+from scr.core.abstract_database_manager import AbstractDatabaseManager
+from scr.core.abstract_async_scraper import AbstractAsyncWebScraper
+from scr.core.abstract_extractor import AbstractProductExtractor
+
+from lxml.html import HtmlElement
+
+from scr.orchestration.base_orchestrator import BaseScrapingOrchestrator
+from scr.orchestration.async_workers import fetch_and_extract, database_writer_task
+from scr.orchestration.rate_limit import AsyncTokenBucket
+
+logger = logging.getLogger(__name__)
+
+class AsyncScrapingOrchestrator(BaseScrapingOrchestrator):
+    """
+    Orchestrates the scraping process on a single asyncio event loop instead of worker threads.
+    Product pages are fetched concurrently (bounded by the async scraper) and written to the
+    database by one writer task. Settings and page parsing helpers come from BaseScrapingOrchestrator,
+    shared with the threaded ScrapingOrchestrator.
+    """
+
+    def __init__(
+        self,
+        scraper: AbstractAsyncWebScraper,
+        db_manager: AbstractDatabaseManager,
+        extractor: AbstractProductExtractor
+    ):
+        """
+        Initializes the orchestrator with its dependencies.
+        Dependencies (async scraper, db_manager, extractor) are injected.
+        """
+        super().__init__(scraper, db_manager, extractor)
+        # Same request rates as the threaded pipeline, enforced on the event loop
+        self.product_rate_limiter, self.category_rate_limiter = self._build_rate_limiters(AsyncTokenBucket)
+
+    def run_scraping(self):
+        """
+        Executes the full scraping workflow on a fresh event loop.
+        """
+        asyncio.run(self.run_scraping_async())
+
+    async def _fetch_category_page(self, category_url: str) -> HtmlElement | None:
+        """Fetches one category page, spaced from the other category pages by category_rate_limiter."""
+        if self.category_rate_limiter is not None:
+            await self.category_rate_limiter.acquire()
+        return await self.main_scraper.fetch_page(category_url, sleep_time=0)
+
+    async def run_scraping_async(self):
+        """
+        Executes the full scraping workflow with asyncio.
+        """
+        start_time = time.perf_counter()
+        logger.info("Starting the full scraping process with asyncio.")
+        loop = asyncio.get_running_loop()
+
+        try:
+            # Blocking database setup runs in the default executor
+            await loop.run_in_executor(None, self.db_manager.create_products_table)
+
+            # Products already stored in the database are not fetched again
+            known_urls = set()
+            if self.skip_known_urls:
+                known_urls = await loop.run_in_executor(None, self.db_manager.load_known_urls)
+                self.main_scraper.add_seen_urls(known_urls)
+
+            # Phase 1: Get category links
+            logger.info("Fetching main page: %s to discover categories.", self.base_url)
+            main_page_tree = await self.main_scraper.fetch_page(self.base_url, sleep_time=0)
+            category_links = self._find_category_links(main_page_tree)
+            if not category_links:
+                logger.error("No relevant category links found. Exiting.")
+                return
+
+            # Phase 2: Fetch all category pages concurrently
+            category_page_trees = await asyncio.gather(*(self._fetch_category_page(link) for link in category_links))
+            all_products_from_categories = []
+            for link, category_page_tree in zip(category_links, category_page_trees):
+                if category_page_tree is not None:
+                    all_products_from_categories.extend(self._get_product_links_from_category_page(link, category_page_tree))
+                else:
+                    logger.warning("Skipping product link extraction for failed category page: %s", link)
+
+            # Deduplicate products by URL and drop the ones already stored, before the test-mode limit applies
+            products_to_process = [
+                p for p in {p.url: p for p in all_products_from_categories}.values() if p.url not in known_urls
+            ]
+            if self.test_mode:
+                products_to_process = products_to_process[:self.test_product_limit]
+                logger.info("Test mode active: Limiting to %d products for scraping.", len(products_to_process))
+
+            logger.info("Scheduling %d unique products for scraping.", len(products_to_process))
+            if not products_to_process:
+                logger.warning("No products to scrape after processing categories and applying limits. Exiting.")
+                return
+
+            # --- Phase 3: Concurrent scraping and a single database writer task ---
+            data_to_write_queue = asyncio.Queue()
+            db_writer = asyncio.create_task(
+                database_writer_task(data_to_write_queue, self.db_manager, self.db_batch_size)
+            )
+
+            await asyncio.gather(*(
+                fetch_and_extract(
+                    product_info,
+                    data_to_write_queue,
+                    self.main_scraper,
+                    self.extractor,
+                    self.product_rate_limiter
+                )
+                for product_info in products_to_process
+            ))
+            logger.info("All product fetching tasks completed.")
+
+            # Signal the database writer to shut down and wait for it to flush
+            await data_to_write_queue.put(None)
+            await db_writer
+            logger.info("Database writer task has shut down.")
+
+        except Exception as e:
+            logger.critical("A critical error occurred during the overall scraping process: %s", e, exc_info=True)
+        finally:
+            await self.main_scraper.close_session()
+            total_execution_time = time.perf_counter() - start_time
+            logger.info(f"\n{'='*60}")
+            logger.info("SCRAPING PROCESS COMPLETE")
+            logger.info(f"Total script execution time: {total_execution_time:.2f} seconds")
+            logger.info(f"{'='*60}\n")
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+
+# Імпортуємо абстрактні класи для тайп-хінтів та для кращої гнучкості
+from scr.core.abstract_async_scraper import AbstractAsyncWebScraper
+from scr.core.abstract_extractor import AbstractProductExtractor
+from scr.core.abstract_database_manager import AbstractDatabaseManager
+
+from scr.orchestration.workers import _flush_product_batch, ProductListing
+from scr.orchestration.rate_limit import AsyncTokenBucket
+
+logger = logging.getLogger(__name__)
+
+async def fetch_and_extract(
+    product_info: ProductListing,
+    data_to_write_queue: asyncio.Queue,
+    # Приймаємо ін'єктовані залежності
+    scraper: AbstractAsyncWebScraper,
+    extractor: AbstractProductExtractor,
+    rate_limiter: AsyncTokenBucket | None
+):
+    """
+    Coroutine that fetches one product page and extracts its details.
+    Many of these run concurrently on the event loop; the scraper bounds how many requests are in flight,
+    and the shared rate_limiter (None means no limit) caps how many start per second.
+    """
+    product_url = product_info.url
+    logger.info("Processing '%s' from category '%s'", product_info.name_on_listing, product_info.category_on_listing)
+
+    try:
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        product_detail_tree = await scraper.fetch_page(product_url)
+        if product_detail_tree is None:
+            logger.warning("Skipping data extraction for failed product page: %s", product_url)
+            return
+
+        # Extraction is synchronous CPU work, so it runs in the default executor to keep the loop fetching
+        product_data = await asyncio.get_running_loop().run_in_executor(
+            None,
+            extractor.extract_product_details,
+            product_detail_tree,
+            product_info.name_on_listing,
+            product_info.category_on_listing
+        )
+        product_data['url'] = product_url
+
+        await data_to_write_queue.put(product_data)
+        logger.debug("Put data for '%s' into write queue.", product_data['product_name'])
+    except Exception as e:
+        logger.error("An error occurred while processing %s: %s", product_url, e, exc_info=True)
+
+
+async def database_writer_task(data_to_write_queue: asyncio.Queue, db_manager: AbstractDatabaseManager, batch_size: int = 100):
+    """
+    Single task that writes extracted product data to the database in batches.
+    The blocking database calls run in the default executor; a None item signals shutdown.
+    """
+    logger.info("Database writer task started.")
+    loop = asyncio.get_running_loop()
+    processed_count = 0
+    batch = []
+    try:
+        # Використовуємо ін'єктований db_manager як контекстний менеджер
+        db = await loop.run_in_executor(None, db_manager.__enter__)
+        exc_info = (None, None, None)
+        try:
+            while True:
+                product_data = await data_to_write_queue.get()
+                if product_data is None:
+                    break
+
+                batch.append(product_data)
+                if len(batch) >= batch_size:
+                    processed_count += await loop.run_in_executor(None, _flush_product_batch, db, batch)
+                    batch = []
+
+            # Flush whatever is left before the context manager commits
+            if batch:
+                processed_count += await loop.run_in_executor(None, _flush_product_batch, db, batch)
+        except BaseException as e:
+            exc_info = (type(e), e, e.__traceback__)
+            raise
+        finally:
+            await loop.run_in_executor(None, db_manager.__exit__, *exc_info)
+    except Exception as e:
+        logger.critical("DB Writer: Critical error with database connection or operation: %s", e, exc_info=True)
+    finally:
+        logger.info("Database writer task finished. Wrote %d items.", processed_count)
@@ -0,0 +1,144 @@
+import abc
+import logging
+import re
+from urllib.parse import urlsplit
+
+import config
+# Імпортуємо абстрактні класи замість конкретних реалізацій
+from scr.core.abstract_database_manager import AbstractDatabaseManager
+from scr.core.abstract_scraper import AbstractWebScraper
+from scr.core.abstract_async_scraper import AbstractAsyncWebScraper
+from scr.core.abstract_extractor import AbstractProductExtractor
+
+from lxml.html import HtmlElement
+from lxml.etree import XPath
+
+from scr.orchestration.workers import ProductListing
+
+logger = logging.getLogger(__name__)
+
+# XPath expressions evaluated on every main/category page, compiled once per process
+_BUTTONS_XP = XPath('//button[@class="_button_3ftu4_1 _stylePrimary_3ftu4_39 _sizeDefault_3ftu4_12 _departmentPill_sticr_199"]')
+_LINK_IN_BTN_XP = XPath('.//a[@href]')
+
+# Product links on category pages are found with a plain element walk (see _get_product_links_from_category_page)
+_PRODUCT_HREF_PREFIX = "/marketplace/"
+_PRODUCT_NAME_CLASS = "rt-Text rt-r-size-2 rt-truncate"
+
+class BaseScrapingOrchestrator(abc.ABC):
+    """
+    Common part of the threaded and the asyncio orchestrators: injected dependencies, settings,
+    and parsing of the main and category pages. Fetching and the scraping workflow itself
+    (run_scraping) are left to the subclasses.
+    """
+
+    def __init__(
+        self,
+        scraper: AbstractWebScraper | AbstractAsyncWebScraper,
+        db_manager: AbstractDatabaseManager,
+        extractor: AbstractProductExtractor
+    ):
+        """
+        Stores the injected dependencies and the settings shared by both pipelines.
+        """
+        self.main_scraper = scraper # Використовуємо ін'єктований скрапер
+        self.db_manager = db_manager # Використовуємо ін'єктований менеджер БД
+        self.extractor = extractor # Використовуємо ін'єктований екстрактор
+
+        settings = config.get_settings()
+        self.base_url = settings.scraper_base_url
+        # Product hrefs are root-relative ("/marketplace/..."), so joining them only needs scheme://host;
+        # computed once here instead of re-parsing base_url with urljoin for every product link
+        base_parts = urlsplit(self.base_url or '')
+        self._url_prefix = f"{base_parts.scheme}://{base_parts.netloc}"
+        self.needed_categories = settings.scraper_needed_categories
+        # One alternation regex matches any needed category keyword in a single C-level scan of the href
+        self._needed_categories_re = re.compile('|'.join(map(re.escape, sorted(self.needed_categories))))
+        self.test_mode = settings.scraper_test_mode
+        self.test_product_limit = settings.test_product_limit
+        self.sleep_between_category_pages = settings.sleep_between_category_pages
+        self.sleep_between_product_pages = settings.sleep_between_product_pages
+        self.db_batch_size = settings.db_batch_size
+        self.skip_known_urls = settings.scraper_skip_known_urls
+        self.scraper_thread_count = settings.scraper_thread_count
+
+        logger.info(f"{type(self).__name__} initialized.")
+        logger.info(f"Test Mode: {self.test_mode}, Test Product Limit: {self.test_product_limit}")
+
+    def _build_rate_limiters(self, bucket_type: type) -> tuple:
+        """
+        Creates the (product, category) rate limiters with the given token bucket class
+        (TokenBucket for threads, AsyncTokenBucket for asyncio); a limiter is None when its sleep setting is 0.
+        Both pipelines therefore allow the same request rates.
+        """
+        # Each worker used to sleep SLEEP_BETWEEN_PRODUCT_PAGES before every request, so the combined rate
+        # that allowed (threads / sleep) is kept as the global product limit
+        product_rate_limiter = (
+            bucket_type(self.scraper_thread_count / self.sleep_between_product_pages, burst=self.scraper_thread_count)
+            if self.sleep_between_product_pages > 0 else None
+        )
+        # Category pages get their own bucket, so they never delay product requests
+        category_rate_limiter = (
+            bucket_type(1 / self.sleep_between_category_pages, burst=1)
+            if self.sleep_between_category_pages > 0 else None
+        )
+        return product_rate_limiter, category_rate_limiter
+
+    @abc.abstractmethod
+    def run_scraping(self):
+        """
+        Executes the full scraping workflow.
+        """
+        pass
+
+    def _find_category_links(self, main_page_tree: HtmlElement | None) -> list[str]:
+        """Extracts the category links matching the needed categories from the parsed main page."""
+        if main_page_tree is None:
+            logger.error("Failed to fetch main page. Cannot find category links.")
+            return []
+
+        buttons = _BUTTONS_XP(main_page_tree)
+        logger.info(f"Found {len(buttons)} potential category buttons.")
+
+        # Single pass: the first link of each button is kept only if its href contains a needed category
+        needed_links = []
+        for btn in buttons:
+            link_elements = _LINK_IN_BTN_XP(btn)
+            if link_elements:
+                href = link_elements[0].get('href')
+                if self._needed_categories_re.search(href):
+                    needed_links.append(href)
+        
+        logger.info(f"✓ Identified {len(needed_links)} category links matching needed criteria: {self.needed_categories}")
+        return needed_links
+
+    def _get_product_links_from_category_page(self, category_url: str, page_tree: HtmlElement) -> list[ProductListing]:
+        """
+        Extracts product links and their basic info (name, category) from a category page.
+        """
+        products_on_this_category_page = []
+        current_category_slug = category_url.split('/')[-1]
+
+        # Walks only <a> elements and rejects non-product links on the cheapest check first,
+        # instead of evaluating contains()/starts-with() predicates in the XPath engine.
+        for product_link_elem in page_tree.iter('a'):
+            href = product_link_elem.get('href')
+            if not href or not href.startswith(_PRODUCT_HREF_PREFIX):
+                continue
+            if product_link_elem.get('data-discover') != 'true' or 'rt-Link' not in (product_link_elem.get('class') or ''):
+                continue
+            
+            product_name = "Unknown Product Name"
+            for span in product_link_elem.iter('span'):
+                if span.get('class') == _PRODUCT_NAME_CLASS:
+                    product_name = span.text_content().strip()
+                    break
+            
+            full_product_url = self._url_prefix + href # href починається з _PRODUCT_HREF_PREFIX, тобто від кореня сайту
+            
+            products_on_this_category_page.append(
+                ProductListing(product_name, full_product_url, current_category_slug)
+            )
+        
+        logger.info("  Found %d product links on category page: %s", len(products_on_this_category_page), current_category_slug)
+        return products_on_this_category_page
@@ -1,10 +1,10 @@
 import time
 import logging
-from urllib.parse import urljoin
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import nullcontext
 import queue
 import threading
-import os
+import multiprocessing
 
 # Import all custom modules
 import config
@@ -22,13 +22,16 @@ from lxml.html import HtmlElement
 
 # Import the worker functions
 from scr.orchestration.workers import scrape_product_worker, database_writer_worker 
+from scr.orchestration.rate_limit import TokenBucket
+from scr.orchestration.base_orchestrator import BaseScrapingOrchestrator
 
 logger = logging.getLogger(__name__)
 
-class ScrapingOrchestrator:
+class ScrapingOrchestrator(BaseScrapingOrchestrator):
     """
     Orchestrates the entire web scraping process using a multithreaded producer-consumer model.
     Manages fetching product pages concurrently and writing data to the database in a dedicated thread.
+    Settings and page parsing helpers come from BaseScrapingOrchestrator.
     """
 
     # Конструктор тепер приймає абстракції як аргументи
@@ -42,179 +45,175 @@ class ScrapingOrchestrator:
         Initializes the orchestrator with its dependencies and thread-safe queues.
         Dependencies (scraper, db_manager, extractor) are injected.
         """
-        self.main_scraper = scraper # Використовуємо ін'єктований скрапер
-        self.db_manager = db_manager # Використовуємо ін'єктований менеджер БД
-        self.extractor = extractor # Використовуємо ін'єктований екстрактор
-
-        self.base_url = config.SCRAPER_BASE_URL
-        self.needed_categories = config.SCRAPER_NEEDED_CATEGORIES
-        self.test_mode = config.SCRAPER_TEST_MODE
-        self.test_product_limit = config.TEST_PRODUCT_LIMIT
-        self.sleep_between_category_pages = config.SLEEP_BETWEEN_CATEGORY_PAGES
-        self.sleep_between_product_pages = config.SLEEP_BETWEEN_PRODUCT_PAGES
-        
-        # --- Queues for multithreading ---
-        self.product_url_queue = queue.Queue()
-        self.data_to_write_queue = queue.Queue()
+        super().__init__(scraper, db_manager, extractor)
+
+        settings = config.get_settings()
+        self.scraper_process_count = settings.scraper_process_count
 
-        self.scraper_thread_count = int(os.getenv("SCRAPER_THREAD_COUNT", "5"))
+        # --- Queues for multithreading ---
+        self.product_url_queue = queue.Queue() # Queue, бо run_scraping чекає на join()
+        # Bounded, so scraping that outruns the database blocks on put() instead of growing memory without limit.
+        # The writer never calls task_done(): shutdown relies on the None sentinel only.
+        self.data_to_write_queue = queue.Queue(maxsize=max(1000, self.scraper_thread_count * 50))
 
-        logger.info(f"ScrapingOrchestrator initialized. Using {self.scraper_thread_count} threads for scraping.")
-        logger.info(f"Test Mode: {self.test_mode}, Test Product Limit: {self.test_product_limit}")
+        # One product bucket shared by all scraper workers, and a separate one for category pages
+        self.product_rate_limiter, self.category_rate_limiter = self._build_rate_limiters(TokenBucket)
 
     def _get_category_links(self) -> list[str]:
         """Scrapes the main page to find relevant category links."""
         logger.info(f"Fetching main page: {self.base_url} to discover categories.")
         # Використовуємо self.main_scraper
         main_page_tree = self.main_scraper.fetch_page(self.base_url, sleep_time=0)
+        return self._find_category_links(main_page_tree)
 
-        if main_page_tree is None:
-            logger.error("Failed to fetch main page. Cannot find category links.")
-            return []
-
-        buttons_xpath = '//button[@class="_button_3ftu4_1 _stylePrimary_3ftu4_39 _sizeDefault_3ftu4_12 _departmentPill_sticr_199"]'
-        buttons = main_page_tree.xpath(buttons_xpath)
-        logger.info(f"Found {len(buttons)} potential category buttons.")
-
-        all_links = []
-        for btn in buttons:
-            link_elements = btn.xpath('.//a[@href]')
-            if link_elements:
-                href = link_elements[0].get('href')
-                all_links.append(href)
-
-        needed_links = []
-        for link in all_links:
-            if any(category_keyword in link for category_keyword in self.needed_categories):
-                needed_links.append(link)
-        
-        logger.info(f"✓ Identified {len(needed_links)} category links matching needed criteria: {self.needed_categories}")
-        return needed_links
-
-    def _get_product_links_from_category_page(self, category_url: str, page_tree: HtmlElement) -> list[dict]:
+    def _fetch_category_page(self, category_url: str, stop_event: threading.Event) -> HtmlElement | None:
         """
-        Extracts product links and their basic info (name, category) from a category page.
+        Fetches one category page, spaced from the other category pages by category_rate_limiter.
+        Returns None without a request once `stop_event` is set (the test-mode limit is already reached).
         """
-        product_links_xpath = '//a[@href and contains(@class, "rt-Link") and @data-discover="true"][@href[starts-with(., "/marketplace/")]]'
-        product_link_elements = page_tree.xpath(product_links_xpath)
-        
-        products_on_this_category_page = []
-        current_category_slug = category_url.split('/')[-1]
-
-        for product_link_elem in product_link_elements:
-            href = product_link_elem.get('href')
-            if not href:
-                logger.warning(f"Found product link element without href on {category_url}.")
-                continue
-            
-            name_element = product_link_elem.xpath('.//span[@class="rt-Text rt-r-size-2 rt-truncate"]')
-            product_name = name_element[0].text_content().strip() if name_element else "Unknown Product Name"
-            
-            full_product_url = urljoin(self.base_url, href)
-            
-            products_on_this_category_page.append({
-                'name_on_listing': product_name,
-                'url': full_product_url,
-                'category_on_listing': current_category_slug
-            })
-        
-        logger.info(f"  Found {len(products_on_this_category_page)} product links on category page: {current_category_slug}")
-        return products_on_this_category_page
+        if self.category_rate_limiter is not None and not self.category_rate_limiter.acquire(stop_event):
+            return None
+        if stop_event.is_set():
+            return None
+        return self.main_scraper.fetch_page(category_url, sleep_time=0)
+
+    def _enqueue_products_from_categories(self, category_links: list[str], known_urls: set[str] = frozenset()) -> int:
+        """
+        Fetches category pages concurrently and puts every new product straight into product_url_queue,
+        so scraper workers start on the first category while later ones are still loading.
+        Products are deduplicated by URL and capped by the test-mode limit. Returns the number enqueued.
+        URLs in `known_urls` (already stored in the database) are never enqueued, so they neither
+        reach the workers' rate limiter nor count toward the test-mode limit.
+        """
+        limit = self.test_product_limit if self.test_mode else None
+        seen_urls = set(known_urls)
+        enqueued_count = 0
+        # Set once the limit is reached; category fetches still waiting for their token then return at once
+        stop_event = threading.Event()
+
+        # Politeness between category pages is enforced by category_rate_limiter, so the fetches overlap
+        # their network waits, and product workers start as soon as the first category page has parsed.
+        logger.info("Fetching %d category pages concurrently.", len(category_links))
+        with ThreadPoolExecutor(max_workers=len(category_links)) as category_executor:
+            # map() yields results in category order, which keeps deduplication and test-mode limits deterministic
+            category_page_trees = category_executor.map(
+                lambda link: self._fetch_category_page(link, stop_event), category_links
+            )
+            for link, category_page_tree in zip(category_links, category_page_trees):
+                if category_page_tree is None:
+                    logger.warning("Skipping product link extraction for failed category page: %s", link)
+                    continue
+
+                for product_info in self._get_product_links_from_category_page(link, category_page_tree):
+                    if product_info.url in seen_urls:
+                        continue
+                    seen_urls.add(product_info.url)
+                    self.product_url_queue.put(product_info)
+                    enqueued_count += 1
+                    if limit is not None and enqueued_count >= limit:
+                        break
+
+                if limit is not None and enqueued_count >= limit:
+                    logger.info("Test mode active: Limiting to %d products for scraping.", enqueued_count)
+                    # The remaining category pages are not needed any more. Every fetch is already running
+                    # (one thread per category), so they are stopped via stop_event rather than by cancelling futures.
+                    stop_event.set()
+                    if self.category_rate_limiter is not None:
+                        self.category_rate_limiter.wake_waiters()
+                    break
 
+        return enqueued_count
 
     def run_scraping(self):
         """
         Executes the full scraping workflow using multithreading.
         """
         start_time = time.perf_counter()
-        logger.info("Starting the full scraping process with multithreading.")
+        logger.info(f"Starting the full scraping process with multithreading. Using {self.scraper_thread_count} threads for scraping.")
 
         try:
             # Викликаємо метод на ін'єктованому db_manager
             self.db_manager.create_products_table()
 
+            # Products already stored in the database are not fetched again
+            known_urls = set()
+            if self.skip_known_urls:
+                known_urls = self.db_manager.load_known_urls()
+                self.main_scraper.add_seen_urls(known_urls)
+
             # Phase 1: Get category links (sequential)
             category_links = self._get_category_links()
             if not category_links:
                 logger.error("No relevant category links found. Exiting.")
                 return
 
-            # Phase 2: Scrape category pages for product links (sequential, populating product_url_queue)
-            all_products_from_categories = []
-            for i, link in enumerate(category_links):
-                logger.info(f"Processing category page {i+1}/{len(category_links)}: {link}")
-                # Використовуємо self.main_scraper
-                category_page_tree = self.main_scraper.fetch_page(link, sleep_time=self.sleep_between_category_pages)
-                
-                if category_page_tree is not None:
-                    products_on_page = self._get_product_links_from_category_page(link, category_page_tree)
-                    all_products_from_categories.extend(products_on_page)
-                else:
-                    logger.warning(f"Skipping product link extraction for failed category page: {link}")
-
-            # Deduplicate products by URL and populate the product_url_queue
-            unique_products_to_process = {p['url']: p for p in all_products_from_categories}.values()
-            
-            if self.test_mode:
-                limited_products = list(unique_products_to_process)[:self.test_product_limit]
-                logger.info(f"Test mode active: Limiting to {len(limited_products)} products for scraping.")
-                for product_info in limited_products:
-                    self.product_url_queue.put(product_info)
-            else:
-                for product_info in unique_products_to_process:
-                    self.product_url_queue.put(product_info)
-
-            logger.info(f"Product URL queue populated with {self.product_url_queue.qsize()} unique products.")
-            if self.product_url_queue.empty():
-                logger.warning("No products to scrape after processing categories and applying limits. Exiting.")
-                return
-
-
-            # --- Phase 3: Start multithreaded scraping and database writing ---
+            # --- Phase 2 + 3: Start the workers first, then stream products to them as category pages parse ---
 
             # Start the dedicated database writer thread
             db_writer_thread = threading.Thread(
                 target=database_writer_worker, 
-                args=(self.data_to_write_queue, self.db_manager), # Передаємо ін'єктований db_manager
+                args=(self.data_to_write_queue, self.db_manager, self.db_batch_size), # Передаємо ін'єктований db_manager
                 daemon=True 
             )
             db_writer_thread.start()
 
-            # Start the scraper worker threads
-            with ThreadPoolExecutor(max_workers=self.scraper_thread_count) as executor:
-                futures = []
-                for i in range(self.scraper_thread_count):
-                    future = executor.submit(
-                        scrape_product_worker, 
-                        i + 1,
-                        self.product_url_queue,
-                        self.data_to_write_queue,
-                        # Передаємо ін'єктовані залежності воркерам, щоб вони їх використовували
-                        self.main_scraper, # Передаємо сам ін'єктований скрапер
-                        self.extractor, # Передаємо ін'єктований екстрактор
-                        self.sleep_between_product_pages 
+            try:
+                # Optional process pool for parsing/extraction (SCRAPER_PROCESS_COUNT=0 keeps it in the threads),
+                # then the scraper worker threads that feed it
+                # "spawn" starts clean interpreters: the pool's processes are created on the first submit(),
+                # when the scraper, category and writer threads are already running, and forking a
+                # multi-threaded process can deadlock the child on locks held by those threads.
+                process_pool_context = (
+                    ProcessPoolExecutor(
+                        max_workers=self.scraper_process_count,
+                        mp_context=multiprocessing.get_context("spawn")
                     )
-                    futures.append(future)
-
-                # Wait for all product fetching tasks to be marked as done in the queue
-                self.product_url_queue.join()
-                logger.info("All product URL fetching tasks completed by worker threads.")
-
-                # Signal scraper workers to shut down by putting sentinel values (None)
-                for _ in range(self.scraper_thread_count):
-                    self.product_url_queue.put(None)
-                
-                # Wait for worker threads to finish their execution gracefully
-                for future in as_completed(futures):
-                    try:
-                        future.result() 
-                    except Exception as exc:
-                        logger.error(f'Worker thread generated an exception: {exc}', exc_info=True)
+                    if self.scraper_process_count > 0 else nullcontext()
+                )
+                with process_pool_context as process_pool, \
+                        ThreadPoolExecutor(max_workers=self.scraper_thread_count) as executor:
+                    futures = []
+                    for i in range(self.scraper_thread_count):
+                        future = executor.submit(
+                            scrape_product_worker, 
+                            i + 1,
+                            self.product_url_queue,
+                            self.data_to_write_queue,
+                            # Передаємо ін'єктовані залежності воркерам, щоб вони їх використовували
+                            self.main_scraper, # Передаємо сам ін'єктований скрапер
+                            self.extractor, # Передаємо ін'єктований екстрактор
+                            self.product_rate_limiter, # Спільний ліміт запитів для всіх воркерів
+                            process_pool # None, якщо парсинг виконується у самих потоках
+                        )
+                        futures.append(future)
 
-            logger.info("All scraper workers have shut down.")
-
-            # Signal the database writer to shut down by putting a sentinel value
-            self.data_to_write_queue.put(None)
+                    try:
+                        enqueued_count = self._enqueue_products_from_categories(category_links, known_urls)
+                        logger.info("Product URL queue received %d unique products.", enqueued_count)
+                        if enqueued_count == 0:
+                            logger.warning("No products to scrape after processing categories and applying limits.")
+
+                        # Wait for all product fetching tasks to be marked as done in the queue
+                        self.product_url_queue.join()
+                        logger.info("All product URL fetching tasks completed by worker threads.")
+                    finally:
+                        # Signal scraper workers to shut down by putting sentinel values (None).
+                        # Done even on errors: workers block on the queue and would otherwise never exit.
+                        for _ in range(self.scraper_thread_count):
+                            self.product_url_queue.put(None)
+                    
+                    # Wait for worker threads to finish their execution gracefully.
+                    # Completion order does not matter here, so result() in submission order is enough.
+                    for future in futures:
+                        try:
+                            future.result() 
+                        except Exception as exc:
+                            logger.error(f'Worker thread generated an exception: {exc}', exc_info=True)
+
+                logger.info("All scraper workers have shut down.")
+            finally:
+                # Signal the database writer to shut down by putting a sentinel value
+                self.data_to_write_queue.put(None)
             
             # Wait for the database writer thread to finish
             db_writer_thread.join(timeout=300) 
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class _BaseTokenBucket:
+    """
+    Token accounting shared by TokenBucket (threads) and AsyncTokenBucket (asyncio).
+    Tokens refill continuously at `rate_per_sec` up to `burst`; subclasses add the waiting.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate_per_sec (float): Sustained number of requests allowed per second.
+            burst (int): Maximum number of requests that may start back-to-back after an idle period.
+        """
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec must be positive.")
+        self.rate_per_sec = rate_per_sec
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        logger.info("%s initialized: %.2f requests/s, burst %d.", type(self).__name__, rate_per_sec, self.burst)
+
+    def _try_take(self) -> float:
+        """
+        Refills the bucket and takes a token if one is available (caller must hold the lock).
+        Returns 0.0 if a token was taken, otherwise the number of seconds until the next one.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate_per_sec)
+        self._last_refill = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate_per_sec
+
+
+class TokenBucket(_BaseTokenBucket):
+    """
+    Thread-safe token bucket shared by all scraper workers.
+    acquire() takes one token, blocking only for as long as it takes the next token to become available.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        """
+        Initializes a full bucket (see _BaseTokenBucket).
+        """
+        super().__init__(rate_per_sec, burst)
+        self._condition = threading.Condition()
+
+    def acquire(self, cancel_event: threading.Event | None = None) -> bool:
+        """
+        Takes one token, waiting until one is available.
+        The wait releases the lock, so other workers can check the bucket in the meantime.
+        Returns False without taking a token if `cancel_event` is set (checked again after wake_waiters()).
+        """
+        with self._condition:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                wait = self._try_take()
+                if wait <= 0:
+                    return True
+                self._condition.wait(wait)
+
+    def wake_waiters(self):
+        """
+        Wakes every thread blocked in acquire(), so the ones whose cancel_event is set return immediately.
+        """
+        with self._condition:
+            self._condition.notify_all()
+
+
+class AsyncTokenBucket(_BaseTokenBucket):
+    """
+    Token bucket for coroutines on one event loop, with the same rate semantics as TokenBucket.
+    Waiters queue on an asyncio.Lock, so tokens are handed out in arrival order.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        """
+        Initializes a full bucket (see _BaseTokenBucket).
+        """
+        super().__init__(rate_per_sec, burst)
+        self._async_lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Takes one token, sleeping on the event loop (not blocking it) until one is available.
+        """
+        async with self._async_lock:
+            while (wait := self._try_take()) > 0:
+                await asyncio.sleep(wait)
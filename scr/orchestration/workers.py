@@ -1,15 +1,46 @@
 import logging
 import queue
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
 
 # Імпортуємо абстрактні класи для тайп-хінтів та для кращої гнучкості
 from scr.core.abstract_scraper import AbstractWebScraper
 from scr.core.abstract_extractor import AbstractProductExtractor
 from scr.core.abstract_database_manager import AbstractDatabaseManager
+from scr.orchestration.rate_limit import TokenBucket
 
 from lxml.html import HtmlElement 
 
 logger = logging.getLogger(__name__)
 
+# One product link found on a category page; a tuple is cheaper to build and read than a dict per product
+ProductListing = namedtuple('ProductListing', 'name_on_listing url category_on_listing')
+
+# How often (in processed products) a worker logs its aggregated error counts
+_ERROR_SUMMARY_EVERY = 100
+
+def _parse_and_extract(
+    parse_content: Callable[[bytes], HtmlElement | None],
+    extractor: AbstractProductExtractor,
+    content: bytes,
+    listing_product_name: str,
+    listing_category: str
+) -> dict | None:
+    """
+    CPU-bound stage of a product page: parses the raw body and extracts the product details.
+    Runs in a ProcessPoolExecutor worker, so only picklable data goes in and only the
+    result dict comes back (the lxml tree never leaves the process). Returns None if parsing failed.
+    """
+    product_tree = parse_content(content)
+    if product_tree is None:
+        return None
+    return extractor.extract_product_details(
+        product_tree=product_tree,
+        listing_product_name=listing_product_name,
+        listing_category=listing_category
+    )
+
 def scrape_product_worker(
     worker_id: int,
     product_url_queue: queue.Queue,
@@ -17,94 +48,173 @@ def scrape_product_worker(
     # Приймаємо ін'єктовані залежності
     scraper: AbstractWebScraper,
     extractor: AbstractProductExtractor,
-    sleep_between_product_pages: int
+    rate_limiter: TokenBucket | None,
+    process_pool: ProcessPoolExecutor | None = None
 ):
     """
     Worker function for fetching and extracting product details.
     Runs in a separate thread from the ThreadPoolExecutor.
     Receives necessary dependencies via arguments (Dependency Injection).
+    All workers share one rate_limiter (None means no limit), which caps the combined request rate.
+    With a process_pool the thread only does the network I/O and hands the raw page to the pool
+    for parsing and extraction, so XPath work on different pages is not serialized by the GIL.
     """
     # Воркер тепер використовує ін'єктований скрапер та екстрактор
     worker_scraper = scraper 
     worker_extractor = extractor
 
     processed_count = 0
+    # Failures are counted by exception type: the full traceback is logged only for the first
+    # occurrence of each type, so a burst of identical errors does not flood the log
+    error_counter = Counter()
     while True:
         try:
-            product_info = product_url_queue.get(timeout=1.5)
+            # Blocking get: the orchestrator streams products in while categories load and always
+            # finishes with one None sentinel per worker, so no timeout is needed to shut down.
+            product_info = product_url_queue.get()
 
             if product_info is None:
                 product_url_queue.task_done()
                 break 
 
             processed_count += 1
-            product_url = product_info['url']
-            product_name_on_listing = product_info['name_on_listing']
-            product_category_on_listing = product_info['category_on_listing']
-
-            logger.info(f"Worker {worker_id}: Processing '{product_name_on_listing}' from category '{product_category_on_listing}'")
-
-            product_detail_tree = worker_scraper.fetch_page(
-                product_url, sleep_time=sleep_between_product_pages
-            )
-
-            if product_detail_tree is not None:
-                product_data = worker_extractor.extract_product_details(
-                    product_tree=product_detail_tree,
-                    listing_product_name=product_name_on_listing,
-                    listing_category=product_category_on_listing
-                )
+            if error_counter and processed_count % _ERROR_SUMMARY_EVERY == 0:
+                logger.warning("Worker %d: errors after %d products: %s", worker_id, processed_count, dict(error_counter))
+            product_url = product_info.url
+            product_name_on_listing = product_info.name_on_listing
+            product_category_on_listing = product_info.category_on_listing
+
+            logger.info("Worker %d: Processing '%s' from category '%s'", worker_id, product_name_on_listing, product_category_on_listing)
+
+            # Known (already stored) URLs are filtered out before they are enqueued, so every token
+            # taken here is spent on a request that is actually sent
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            product_data = None
+            if process_pool is not None:
+                content = worker_scraper.fetch_content(product_url)
+                if content is not None:
+                    # The thread waits for its own page only; other threads keep fetching meanwhile
+                    product_data = process_pool.submit(
+                        _parse_and_extract,
+                        worker_scraper.parse_content,
+                        worker_extractor,
+                        content,
+                        product_name_on_listing,
+                        product_category_on_listing
+                    ).result()
+            else:
+                product_detail_tree = worker_scraper.fetch_page(product_url)
+                if product_detail_tree is not None:
+                    product_data = worker_extractor.extract_product_details(
+                        product_tree=product_detail_tree,
+                        listing_product_name=product_name_on_listing,
+                        listing_category=product_category_on_listing
+                    )
+
+            if product_data is not None:
                 product_data['url'] = product_url 
                 
                 data_to_write_queue.put(product_data)
-                logger.debug(f"Worker {worker_id}: Put data for '{product_data['product_name']}' into write queue.")
+                logger.debug("Worker %d: Put data for '%s' into write queue.", worker_id, product_data['product_name'])
             else:
-                logger.warning(f"Worker {worker_id}: Skipping data extraction for failed product page: {product_url}")
+                logger.warning("Worker %d: Skipping data extraction for failed product page: %s", worker_id, product_url)
 
             product_url_queue.task_done() 
-        except queue.Empty:
-            logger.info(f"Worker {worker_id}: Product URL queue is empty, shutting down due to timeout.")
-            break
         except Exception as e:
-            logger.error(f"Worker {worker_id}: An error occurred: {e}", exc_info=True)
-            if 'product_url_queue' in locals(): # Перевірка на випадок, якщо product_url_queue не визначена
-                product_url_queue.task_done()
+            error_type = type(e).__name__
+            error_counter[error_type] += 1
+            if error_counter[error_type] == 1:
+                logger.error("Worker %d: An error occurred (first %s): %s", worker_id, error_type, e, exc_info=True)
+            else:
+                logger.debug("Worker %d: item error: %r", worker_id, e)
+            # get() blocks without a timeout and cannot fail, so an error always belongs to a dequeued product
+            product_url_queue.task_done()
 
     # Скрапер worker_scraper більше не закриває сесію, оскільки він її не створював.
     # Сесія буде закрита оркестратором, який її створив.
-    logger.info(f"Worker {worker_id} finished processing {processed_count} products.")
+    logger.info("Worker %d finished processing %d products.", worker_id, processed_count)
+    if error_counter:
+        logger.warning("Worker %d: errors by type: %s", worker_id, dict(error_counter))
 
 
-def database_writer_worker(data_to_write_queue: queue.Queue, db_manager: AbstractDatabaseManager): # <--- ЗМІНА ТУТ
+def _flush_product_batch(db: AbstractDatabaseManager, batch: list[dict]) -> int:
+    """
+    Writes the accumulated batch in one round trip, commits it, and returns the number of rows written.
+    If the batch fails it is rolled back and its rows are retried one by one (each committed on its own),
+    so a single bad row only loses itself and the transaction is never left aborted for the following batches.
+    """
+    try:
+        written = db.insert_product_data_batch(batch)
+        db.commit()
+        logger.info("DB Writer: ✓ Inserted/Updated batch of %d products.", written)
+        return written
+    except Exception as e:
+        logger.error("DB Writer: ✗ Failed to insert/update batch of %d products, retrying row by row: %s", len(batch), e, exc_info=True)
+        try:
+            db.rollback()
+        except Exception as rollback_error:
+            logger.error("DB Writer: ✗ Rollback after failed batch also failed: %s", rollback_error)
+            return 0
+
+    written = 0
+    # Same duplicate-URL collapsing as the batch insert: the latest row per url wins
+    for row in {row['url']: row for row in batch}.values():
+        try:
+            db.insert_product_data(row)
+            db.commit()
+            written += 1
+        except Exception as e:
+            logger.error("DB Writer: ✗ Dropped product %s: %s", row.get('url', 'Unknown URL'), e)
+            try:
+                db.rollback()
+            except Exception as rollback_error:
+                logger.error("DB Writer: ✗ Rollback after failed row also failed: %s", rollback_error)
+                break
+    logger.info("DB Writer: ✓ Inserted/Updated %d of %d products from the failed batch one by one.", written, len(batch))
+    return written
+
+
+def database_writer_worker(data_to_write_queue: queue.Queue, db_manager: AbstractDatabaseManager, batch_size: int = 100):
     """
     Dedicated worker function for writing extracted product data to the database.
     Runs in a single separate thread. Receives db_manager via arguments.
+    After each blocking get(), everything already waiting in the queue (up to `batch_size` items)
+    is drained without blocking and written/committed as one batch.
     """
     logger.info("Database writer thread started.")
     processed_count = 0
+    shutting_down = False
     try:
         # Використовуємо ін'єктований db_manager як контекстний менеджер
         with db_manager as db: 
-            while True:
-                try:
-                    product_data = data_to_write_queue.get(timeout=10) 
-
+            while not shutting_down:
+                # Blocking get: with streamed categories there can be long gaps before the next product,
+                # and the orchestrator always finishes with a None sentinel.
+                product_data = data_to_write_queue.get()
+                if product_data is None:
+                    shutting_down = True
+                    break 
+
+                batch = [product_data]
+                # Drain what producers have already queued, so one round trip and one commit cover them all
+                while len(batch) < batch_size:
+                    try:
+                        product_data = data_to_write_queue.get_nowait()
+                    except queue.Empty:
+                        break
                     if product_data is None:
-                        data_to_write_queue.task_done()
-                        break 
+                        shutting_down = True
+                        break
+                    batch.append(product_data)
 
-                    try:
-                        db.insert_product_data(product_data)
-                        processed_count += 1
-                        logger.info(f"DB Writer: ✓ Inserted/Updated data for '{product_data['product_name']}'. Total: {processed_count}")
-                    except Exception as e:
-                        logger.error(f"DB Writer: ✗ Failed to insert/update data for '{product_data.get('url', 'Unknown URL')}': {e}", exc_info=True)
-                    finally:
-                        data_to_write_queue.task_done()
-                except queue.Empty:
-                    logger.info("DB Writer: Data queue is empty, shutting down due to timeout.")
-                    break
+                processed_count += _flush_product_batch(db, batch)
     except Exception as e:
-        logger.critical(f"DB Writer: Critical error with database connection or operation: {e}", exc_info=True)
+        logger.critical("DB Writer: Critical error with database connection or operation: %s", e, exc_info=True)
+        # The queue is bounded: keep consuming (and dropping) items until the sentinel,
+        # otherwise scraper workers blocked on put() would never finish
+        if not shutting_down:
+            while data_to_write_queue.get() is not None:
+                pass
     finally:
-        logger.info(f"Database writer thread finished. Wrote {processed_count} items.")
\ No newline at end of file
+        logger.info("Database writer thread finished. Wrote %d items.", processed_count)
\ No newline at end of file